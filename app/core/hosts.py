@@ -256,7 +256,7 @@ async def _prepare_subscription_inbound_data(
         )
 
     # Compute flow_enabled: only for VLESS with specific conditions
-    header_type = getattr(transport_config, "header_type", "none")
+    header_type = transport_config.header_type
     flow_enabled = (
         protocol == "vless"
         and tls_value in ("tls", "reality")
@@ -66,6 +66,12 @@ class GetDB:  # Context Manager
                 pass
 
 
+# AsyncSession.info key of the per-request node lookup cache (see app.db.crud.node)
+REQUEST_NODE_CACHE_KEY = "node_cache"
+
+
 async def get_db():  # Dependency
     async with GetDB() as db:
+        # Request sessions memoize single-node lookups until the request ends
+        db.info[REQUEST_NODE_CACHE_KEY] = {}
         yield db
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Numeric, TypeDecorator
+from sqlalchemy import DateTime, String, Numeric, TypeDecorator
 from sqlalchemy.sql.expression import FunctionElement
 from sqlalchemy.ext.compiler import compiles
 
@@ -116,3 +116,49 @@ def compile_date_diff_mysql(element, compiler, **kw):
 @compiles(DateDiff, "sqlite")
 def compile_date_diff_sqlite(element, compiler, **kw):
     return f"julianday({compiler.process(element.date1)}) - julianday({compiler.process(element.date2)})"
+
+
+class Epoch(FunctionElement):
+    """Seconds since 1970-01-01 00:00:00 UTC for a UTC timestamp expression."""
+
+    type = Numeric()
+    name = "epoch"
+    inherit_cache = True
+
+
+@compiles(Epoch, "postgresql")
+def compile_epoch_postgresql(element, compiler, **kw):
+    return f"EXTRACT(EPOCH FROM {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(Epoch, "mysql")
+def compile_epoch_mysql(element, compiler, **kw):
+    return f"TIMESTAMPDIFF(SECOND, '1970-01-01 00:00:00', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(Epoch, "sqlite")
+def compile_epoch_sqlite(element, compiler, **kw):
+    return f"CAST(strftime('%s', {compiler.process(element.clauses, **kw)}) AS INTEGER)"
+
+
+class DayStart(FunctionElement):
+    """Midnight (UTC) of the day containing a UTC timestamp, comparable with stored DateTime values."""
+
+    type = DateTime(timezone=True)
+    name = "day_start"
+    inherit_cache = True
+
+
+@compiles(DayStart, "postgresql")
+def compile_day_start_postgresql(element, compiler, **kw):
+    return f"timezone('UTC', date_trunc('day', timezone('UTC', {compiler.process(element.clauses, **kw)})))"
+
+
+@compiles(DayStart, "mysql")
+def compile_day_start_mysql(element, compiler, **kw):
+    return f"TIMESTAMP(DATE({compiler.process(element.clauses, **kw)}))"
+
+
+@compiles(DayStart, "sqlite")
+def compile_day_start_sqlite(element, compiler, **kw):
+    return f"strftime('%Y-%m-%d 00:00:00.000000', {compiler.process(element.clauses, **kw)})"
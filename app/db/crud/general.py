@@ -187,10 +187,28 @@ def attach_timezone_to_period_start(row_dict: dict, target_tz, dialect: str = No
         target_tz: Timezone to attach to the period_start
         dialect: Database dialect name (for handling dialect-specific formats)
     """
-    if "period_start" not in row_dict or row_dict["period_start"] is None or target_tz is None:
+    if "period_start" not in row_dict:
         return
 
-    period_start = row_dict["period_start"]
+    row_dict["period_start"] = period_start_with_timezone(row_dict["period_start"], target_tz, dialect)
+
+
+def period_start_with_timezone(period_start, target_tz, dialect: str | None = None):
+    """
+    Return period_start with timezone info attached, for callers that read rows as tuples.
+
+    Args:
+        period_start: period_start value as returned by the database (string or datetime)
+        target_tz: Timezone to attach to the period_start
+        dialect: Database dialect name (for handling dialect-specific formats)
+
+    Returns:
+        The timezone-aware datetime, or period_start unchanged if it can't be parsed
+    """
+    if period_start is None or target_tz is None:
+        return period_start
+
+    raw_period_start = period_start
 
     # If it's a string (SQLite or MySQL), parse it to datetime first
     if isinstance(period_start, str):
@@ -216,7 +234,7 @@ def attach_timezone_to_period_start(row_dict: dict, target_tz, dialect: str = No
                 period_start = datetime.fromisoformat(clean_str)
         except (ValueError, AttributeError):
             # If parsing fails, leave as is
-            return
+            return raw_period_start
 
     # If period_start is already timezone-aware, we MUST replace the timezone, NOT convert it.
     # Why? Because _build_trunc_expression returns a timestamp representing "Wall Clock Time"
@@ -233,9 +251,9 @@ def attach_timezone_to_period_start(row_dict: dict, target_tz, dialect: str = No
     # So we must discard the driver's timezone assumption and stamp it with the correct timezone.
     if isinstance(period_start, datetime):
         # Always replace, never convert
-        period_start = period_start.replace(tzinfo=target_tz)
+        return period_start.replace(tzinfo=target_tz)
 
-        row_dict["period_start"] = period_start
+    return raw_period_start
 
 
 def to_utc_for_filter(dt: Optional[datetime]) -> Optional[datetime]:
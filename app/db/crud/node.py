@@ -1,36 +1,68 @@
-from datetime import datetime, timezone
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Optional, Union
-
-from sqlalchemy import and_, bindparam, case, delete, func, literal_column, or_, select, update
-from sqlalchemy.exc import InvalidRequestError
+from typing import NamedTuple, Optional, Union
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import Select
 from sqlalchemy.sql.functions import coalesce
 
-from app.db.compiles_types import DateDiff
+from app.db.base import REQUEST_NODE_CACHE_KEY
+from app.db.compiles_types import DateDiff, DayStart, Epoch
 from app.db.models import (
     DataLimitResetStrategy,
     Node,
     NodeStat,
     NodeStatus,
     NodeUsage,
+    NodeUsageDaily,
     NodeUsageResetLogs,
     NodeUserUsage,
 )
 from app.models.node import NodeCreate, NodeModify, UsageTable
 from app.models.stats import NodeStats, NodeStatsList, NodeUsageStat, NodeUsageStatsList, Period
+import config
 
 
 from .general import (
     _build_trunc_expression,
     _get_next_period_boundary,
     attach_timezone_to_period_start,
+    period_start_with_timezone,
     to_utc_for_filter,
     MYSQL_FORMATS,
     SQLITE_FORMATS,
 )
 
 
+# Rows fetched per round-trip when streaming bucketed usage/stats results
+STATS_YIELD_PER = 1000
+
+# Days between interval-based (reset_time == -1) resets
+RESET_STRATEGY_TO_DAYS = {
+    DataLimitResetStrategy.day: 1,
+    DataLimitResetStrategy.week: 7,
+    DataLimitResetStrategy.month: 30,
+    DataLimitResetStrategy.year: 365,
+}
+
+
 NodeSortingOptionsSimple = Enum(
     "NodeSortingOptionsSimple",
     {
@@ -42,11 +74,48 @@ NodeSortingOptionsSimple = Enum(
 )
 
 
+def _build_node_select_stmt(*, raise_on_lazy_load: bool = False) -> Select:
+    """
+    Build a node select statement with eager-load options.
+
+    When raise_on_lazy_load is True, any relationship that is not eagerly loaded
+    raises on access instead of silently emitting an extra query per node.
+    """
+    options = [selectinload(Node.usage_logs)]
+    if raise_on_lazy_load:
+        options.append(raiseload("*"))
+    return select(Node).options(*options)
+
+
 async def load_node_attrs(node: Node):
-    try:
-        await node.awaitable_attrs.usage_logs
-    except AttributeError:
-        pass
+    await node.awaitable_attrs.usage_logs
+
+
+async def _get_cached_node(db: AsyncSession, key: tuple, stmt: Select) -> Optional[Node]:
+    """
+    Runs a single-node lookup, reusing the result within a request when the session has a node cache.
+    """
+    cache = db.info.get(REQUEST_NODE_CACHE_KEY)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    db_node = (await db.execute(stmt)).unique().scalar_one_or_none()
+    # Misses are not cached so a node created later in the request is still found
+    if cache is not None and db_node is not None:
+        # Also keep the lookup key, it can differ from the stored name (e.g. case-insensitive collations)
+        cache[key] = db_node
+        cache[("id", db_node.id)] = db_node
+        cache[("name", db_node.name)] = db_node
+    return db_node
+
+
+def _invalidate_node_cache(db: AsyncSession, *db_nodes: Node) -> None:
+    cache = db.info.get(REQUEST_NODE_CACHE_KEY)
+    if not cache:
+        return
+    # Match by identity so every alias is dropped, the node may have been renamed since it was cached
+    for key in [key for key, cached in cache.items() if any(cached is db_node for db_node in db_nodes)]:
+        del cache[key]
 
 
 async def get_node(db: AsyncSession, name: str) -> Optional[Node]:
@@ -60,10 +129,7 @@ async def get_node(db: AsyncSession, name: str) -> Optional[Node]:
     Returns:
         Optional[Node]: The Node object if found, None otherwise.
     """
-    node = (await db.execute(select(Node).where(Node.name == name))).unique().scalar_one_or_none()
-    if node:
-        await load_node_attrs(node)
-    return node
+    return await _get_cached_node(db, ("name", name), _build_node_select_stmt().where(Node.name == name))
 
 
 async def get_node_by_id(db: AsyncSession, node_id: int) -> Optional[Node]:
@@ -77,10 +143,7 @@ async def get_node_by_id(db: AsyncSession, node_id: int) -> Optional[Node]:
     Returns:
         Optional[Node]: The Node object if found, None otherwise.
     """
-    node = (await db.execute(select(Node).where(Node.id == node_id))).unique().scalar_one_or_none()
-    if node:
-        await load_node_attrs(node)
-    return node
+    return await _get_cached_node(db, ("id", node_id), _build_node_select_stmt().where(Node.id == node_id))
 
 
 async def get_nodes(
@@ -111,7 +174,7 @@ async def get_nodes(
             - list[Node]: A list of Node objects matching the criteria.
             - int: The total count of nodes matching the filters (before offset/limit).
     """
-    query = select(Node)
+    query = _build_node_select_stmt(raise_on_lazy_load=config.DEBUG)
 
     if status:
         if isinstance(status, list):
@@ -134,19 +197,25 @@ async def get_nodes(
             like_expression = f"%{search_value}%"
             query = query.where(or_(Node.name.ilike(like_expression), Node.api_key.ilike(like_expression)))
 
-    # Get count before applying offset/limit
-    count_query = select(func.count()).select_from(query.subquery())
-    count = (await db.execute(count_query)).scalar_one()
+    # Window count is computed before offset/limit, so rows and total come from a single scan
+    paginated_query = query.add_columns(func.count().over().label("total_count"))
 
     # Apply pagination
     if offset:
-        query = query.offset(offset)
+        paginated_query = paginated_query.offset(offset)
     if limit:
-        query = query.limit(limit)
+        paginated_query = paginated_query.limit(limit)
+
+    rows = (await db.execute(paginated_query)).all()
+    db_nodes = [row.Node for row in rows]
 
-    db_nodes = (await db.execute(query)).scalars().all()
-    for node in db_nodes:
-        await load_node_attrs(node)
+    if rows:
+        count = rows[0].total_count
+    elif offset:
+        # Page is past the end, fall back to a plain count to keep the total accurate
+        count = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+    else:
+        count = 0
 
     return db_nodes, count
 
@@ -220,16 +289,50 @@ async def get_limited_nodes(db: AsyncSession) -> list[Node]:
     Returns:
         list[Node]: Nodes that should be limited
     """
-    query = select(Node).where(
+    query = _build_node_select_stmt(raise_on_lazy_load=config.DEBUG).where(
         and_(
             Node.status.in_([NodeStatus.error, NodeStatus.connected, NodeStatus.connecting]),
             Node.is_limited,
         )
     )
-    nodes = (await db.execute(query)).scalars().all()
-    for node in nodes:
-        await load_node_attrs(node)
-    return nodes
+    return (await db.execute(query)).scalars().all()
+
+
+def _build_node_usage_source(
+    period: Period, start: datetime, start_utc: datetime, end_utc: datetime, node_id: int | None = None
+):
+    """
+    Builds the selectable that get_nodes_usage aggregates over.
+
+    Day and month buckets without a timezone offset read every whole UTC day from the
+    NodeUsageDaily rollup, and only the partial days at either edge of the range from NodeUsage.
+    Any other period or timezone reads NodeUsage directly.
+    """
+    if period not in (Period.day, Period.month) or start.utcoffset():
+        return NodeUsage.__table__
+
+    first_day = start_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+    if first_day < start_utc:
+        first_day += timedelta(days=1)
+    last_day = end_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+    if first_day >= last_day:
+        return NodeUsage.__table__
+
+    raw_stmt = select(NodeUsage.created_at, NodeUsage.node_id, NodeUsage.uplink, NodeUsage.downlink).where(
+        or_(
+            and_(NodeUsage.created_at >= start_utc, NodeUsage.created_at < first_day),
+            and_(NodeUsage.created_at >= last_day, NodeUsage.created_at < end_utc),
+        )
+    )
+    daily_stmt = select(
+        NodeUsageDaily.created_at, NodeUsageDaily.node_id, NodeUsageDaily.uplink, NodeUsageDaily.downlink
+    ).where(NodeUsageDaily.created_at >= first_day, NodeUsageDaily.created_at < last_day)
+
+    if node_id is not None:
+        raw_stmt = raw_stmt.where(NodeUsage.node_id == node_id)
+        daily_stmt = daily_stmt.where(NodeUsageDaily.node_id == node_id)
+
+    return union_all(raw_stmt, daily_stmt).subquery("node_usages")
 
 
 async def get_nodes_usage(
@@ -262,16 +365,19 @@ async def get_nodes_usage(
     # Get database dialect for later use
     dialect = db.bind.dialect.name
 
-    # Build truncation expression with timezone support
-    trunc_expr = _build_trunc_expression(db, period, NodeUsage.created_at, start)
-
     # Filter using UTC timestamps (DB stores naive UTC)
     start_utc = to_utc_for_filter(start)
     end_utc = to_utc_for_filter(end)
-    conditions = [NodeUsage.created_at >= start_utc, NodeUsage.created_at < end_utc]
+
+    usage = _build_node_usage_source(period, start, start_utc, end_utc, node_id)
+
+    # Build truncation expression with timezone support
+    trunc_expr = _build_trunc_expression(db, period, usage.c.created_at, start)
+
+    conditions = [usage.c.created_at >= start_utc, usage.c.created_at < end_utc]
 
     if node_id is not None:
-        conditions.append(NodeUsage.node_id == node_id)
+        conditions.append(usage.c.node_id == node_id)
     else:
         node_id = -1  # Default value for node_id when not specified
 
@@ -279,20 +385,20 @@ async def get_nodes_usage(
         stmt = (
             select(
                 trunc_expr.label("period_start"),
-                func.coalesce(NodeUsage.node_id, 0).label("node_id"),
-                func.sum(NodeUsage.downlink).label("downlink"),
-                func.sum(NodeUsage.uplink).label("uplink"),
+                func.coalesce(usage.c.node_id, 0).label("node_id"),
+                func.sum(usage.c.downlink).label("downlink"),
+                func.sum(usage.c.uplink).label("uplink"),
             )
             .where(and_(*conditions))
-            .group_by(trunc_expr, NodeUsage.node_id)
-            .order_by(trunc_expr, NodeUsage.node_id)
+            .group_by(trunc_expr, usage.c.node_id)
+            .order_by(trunc_expr, usage.c.node_id)
         )
     else:
         stmt = (
             select(
                 trunc_expr.label("period_start"),
-                func.sum(NodeUsage.downlink).label("downlink"),
-                func.sum(NodeUsage.uplink).label("uplink"),
+                func.sum(usage.c.downlink).label("downlink"),
+                func.sum(usage.c.uplink).label("uplink"),
             )
             .where(and_(*conditions))
             .group_by(trunc_expr)
@@ -320,21 +426,26 @@ async def get_nodes_usage(
             boundary_str = boundary_value.strftime(format_str.replace("%i", "%M"))
             stmt = stmt.having(literal_column("period_start") >= boundary_str)
 
-    result = await db.execute(stmt)
-
-    stats = {}
-    for row in result.mappings():
-        row_dict = dict(row)
-        node_id_val = row_dict.pop("node_id", node_id)
-
-        # Attach timezone info to period_start
-        attach_timezone_to_period_start(row_dict, start.tzinfo, dialect)
+    result = await db.stream(stmt.execution_options(yield_per=STATS_YIELD_PER))
 
-        if node_id_val not in stats:
-            stats[node_id_val] = []
-        stats[node_id_val].append(NodeUsageStat(**row_dict))
+    stats = defaultdict(list)
+    async for row in result:
+        if group_by_node:
+            period_start, node_id_val, downlink, uplink = row
+        else:
+            period_start, downlink, uplink = row
+            node_id_val = node_id
+
+        stats[node_id_val].append(
+            NodeUsageStat(
+                # Attach timezone info to period_start
+                period_start=period_start_with_timezone(period_start, start.tzinfo, dialect),
+                downlink=downlink,
+                uplink=uplink,
+            )
+        )
 
-    return NodeUsageStatsList(period=period, start=start, end=end, stats=stats)
+    return NodeUsageStatsList(period=period, start=start, end=end, stats=dict(stats))
 
 
 async def get_node_stats(
@@ -386,11 +497,11 @@ async def get_node_stats(
             boundary_str = boundary_value.strftime(format_str.replace("%i", "%M"))  # %i -> %M for Python
             stmt = stmt.having(trunc_expr >= boundary_str)
 
-    result = await db.execute(stmt)
+    result = await db.stream(stmt.execution_options(yield_per=STATS_YIELD_PER))
 
     # Convert period_start to target timezone if specified
     stats = []
-    for row in result.mappings():
+    async for row in result.mappings():
         row_dict = dict(row)
         # Attach timezone info to period_start
         attach_timezone_to_period_start(row_dict, start.tzinfo, dialect)
@@ -411,12 +522,24 @@ async def create_node(db: AsyncSession, node: NodeCreate) -> Node:
     Returns:
         Node: The newly created Node object.
     """
-    db_node = Node(**node.model_dump())
+    if not db.bind.dialect.insert_returning:
+        # MySQL has no INSERT ... RETURNING, fall back to flushing and re-reading the row
+        db_node = Node(**node.model_dump())
+
+        db.add(db_node)
+        await db.commit()
+        await db.refresh(db_node)
+        await load_node_attrs(db_node)
+        return db_node
+
+    # created_at uses a dataclass default_factory, which only applies to the constructor
+    values = {**node.model_dump(), "created_at": datetime.now(timezone.utc)}
+    db_node = (await db.scalars(insert(Node).returning(Node), [values])).one()
+
+    # A new node has no reset logs yet, mark the collection as loaded instead of querying it
+    set_committed_value(db_node, "usage_logs", [])
 
-    db.add(db_node)
     await db.commit()
-    await db.refresh(db_node)
-    await load_node_attrs(db_node)
     return db_node
 
 
@@ -429,12 +552,13 @@ async def remove_node(db: AsyncSession, db_node: Node) -> None:
         db_node (Node): The Node object to be removed.
     """
     node_id = db_node.id
+    _invalidate_node_cache(db, db_node)
 
-    # Remove dependent rows explicitly to avoid ORM cascading overhead on large tables.
-    await db.execute(delete(NodeUserUsage).where(NodeUserUsage.node_id == node_id))
-    await db.execute(delete(NodeUsage).where(NodeUsage.node_id == node_id))
-    await db.execute(delete(NodeUsageResetLogs).where(NodeUsageResetLogs.node_id == node_id))
-    await db.execute(delete(NodeStat).where(NodeStat.node_id == node_id))
+    # Dependent rows are removed by ON DELETE CASCADE in a single statement.
+    # SQLite connections don't enforce foreign keys, so there they are removed explicitly.
+    if db.bind.dialect.name == "sqlite":
+        for model in (NodeUserUsage, NodeUsage, NodeUsageDaily, NodeUsageResetLogs, NodeStat):
+            await db.execute(delete(model).where(model.node_id == node_id))
     await db.execute(delete(Node).where(Node.id == node_id))
 
     await db.commit()
@@ -452,11 +576,12 @@ async def modify_node(db: AsyncSession, db_node: Node, modify: NodeModify) -> No
     Returns:
         Node: The modified Node object.
     """
+    _invalidate_node_cache(db, db_node)
 
-    node_data = modify.model_dump(exclude_none=True)
-
-    for key, value in node_data.items():
-        setattr(db_node, key, value)
+    for key in modify.model_fields_set:
+        value = getattr(modify, key)
+        if value is not None:
+            setattr(db_node, key, value)
 
     db_node.xray_version = None
     db_node.message = None
@@ -494,37 +619,55 @@ async def update_node_status(
     Returns:
         Node: The updated Node object.
     """
-    stmt = (
-        update(Node)
-        .where(Node.id == db_node.id)
-        .values(
-            status=status,
-            message=message,
-            xray_version=xray_version,
-            node_version=node_version,
-            last_status_change=datetime.now(timezone.utc),
-        )
-    )
-    await db.execute(stmt)
+    _invalidate_node_cache(db, db_node)
+
+    values = {
+        "status": status,
+        "message": message,
+        "xray_version": xray_version,
+        "node_version": node_version,
+        "last_status_change": datetime.now(timezone.utc),
+    }
+    await db.execute(update(Node).where(Node.id == db_node.id).values(**values))
     await db.commit()
 
-    try:
-        # Prefer refreshing the existing instance to keep relationships loaded
-        await db.refresh(db_node)
-    except InvalidRequestError:
+    if inspect(db_node).detached:
         # If the instance was detached (e.g., used across sessions), re-fetch it
         db_node = (await db.execute(select(Node).where(Node.id == db_node.id))).scalar_one()
+    else:
+        # Every changed column is known, so sync it onto the instance instead of re-selecting the row
+        for key, value in values.items():
+            set_committed_value(db_node, key, value)
 
     await load_node_attrs(db_node)
     return db_node
 
 
+_TABLE_MODEL_MAP = {
+    UsageTable.node_user_usages: NodeUserUsage,
+    UsageTable.node_usages: NodeUsage,
+}
+
+
 def _table_model(table: UsageTable):
-    if table == UsageTable.node_user_usages:
-        return NodeUserUsage
-    if table == UsageTable.node_usages:
-        return NodeUsage
-    raise ValueError("Invalid table enum")
+    model = _TABLE_MODEL_MAP.get(table)
+    if model is None:
+        raise ValueError("Invalid table enum")
+    return model
+
+
+# Built once so every call hits the engine's compiled statement cache with the same statement
+_BULK_NODE_STATUS_STMT = (
+    update(Node)
+    .where(Node.id == bindparam("node_id"))
+    .values(
+        status=bindparam("status"),
+        message=bindparam("message"),
+        xray_version=bindparam("xray_version"),
+        node_version=bindparam("node_version"),
+        last_status_change=bindparam("now"),
+    )
+)
 
 
 async def bulk_update_node_status(
@@ -547,51 +690,172 @@ async def bulk_update_node_status(
     if not updates:
         return
 
-    stmt = (
-        update(Node)
-        .where(Node.id == bindparam("node_id"))
-        .values(
-            status=bindparam("status"),
-            message=bindparam("message"),
-            xray_version=bindparam("xray_version"),
-            node_version=bindparam("node_version"),
-            last_status_change=bindparam("now"),
-        )
-    )
-
-    # Add timestamp to each update
+    # Add timestamp to each update without mutating the caller's dicts
     now = datetime.now(timezone.utc)
-    for upd in updates:
-        upd["now"] = now
+    params = [{**upd, "now": now} for upd in updates]
 
     # Execute using connection-level execute (bypasses ORM, allows bindparam with WHERE)
     conn = await db.connection()
-    await conn.execute(stmt, updates)
+    await conn.execute(_BULK_NODE_STATUS_STMT, params)
     await db.commit()
 
 
 async def clear_usage_data(
     db: AsyncSession, table: UsageTable, start: datetime | None = None, end: datetime | None = None
 ):
+    model = _table_model(table)
+    start_utc = to_utc_for_filter(start)
+    end_utc = to_utc_for_filter(end)
+
     filters = []
-    if start:
-        filters.append(getattr(_table_model(table), "created_at") >= start.replace(tzinfo=timezone.utc))
-    if end:
-        filters.append(getattr(_table_model(table), "created_at") < end.replace(tzinfo=timezone.utc))
+    if start_utc:
+        filters.append(model.created_at >= start_utc)
+    if end_utc:
+        filters.append(model.created_at < end_utc)
 
-    stmt = delete(_table_model(table))
+    stmt = delete(model)
     if filters:
         stmt = stmt.where(and_(*filters))
 
     await db.execute(stmt)
+    if table == UsageTable.node_usages:
+        await rebuild_node_usage_daily(db, start_utc, end_utc)
     await db.commit()
 
 
+async def rebuild_node_usage_daily(db: AsyncSession, start: datetime | None = None, end: datetime | None = None):
+    """
+    Recomputes the NodeUsageDaily rollup from NodeUsage for every UTC day overlapping [start, end).
+    """
+    start = to_utc_for_filter(start)
+    end = to_utc_for_filter(end)
+
+    filters = []
+    daily_filters = []
+    if start:
+        first_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        filters.append(NodeUsage.created_at >= first_day)
+        daily_filters.append(NodeUsageDaily.created_at >= first_day)
+    if end:
+        last_day = end.replace(hour=0, minute=0, second=0, microsecond=0)
+        if last_day < end:
+            last_day += timedelta(days=1)
+        filters.append(NodeUsage.created_at < last_day)
+        daily_filters.append(NodeUsageDaily.created_at < last_day)
+
+    delete_stmt = delete(NodeUsageDaily)
+    if daily_filters:
+        delete_stmt = delete_stmt.where(and_(*daily_filters))
+    await db.execute(delete_stmt)
+
+    day_start = DayStart(NodeUsage.created_at)
+    select_stmt = select(
+        day_start,
+        NodeUsage.node_id,
+        func.coalesce(func.sum(NodeUsage.uplink), 0),
+        func.coalesce(func.sum(NodeUsage.downlink), 0),
+    ).group_by(day_start, NodeUsage.node_id)
+    if filters:
+        select_stmt = select_stmt.where(and_(*filters))
+    await db.execute(insert(NodeUsageDaily).from_select(["created_at", "node_id", "uplink", "downlink"], select_stmt))
+
+
+class _ResetClock(NamedTuple):
+    """
+    Epoch starts of the current UTC day/week/month/year and the seconds elapsed since each.
+
+    Every time-based schedule is expressed as "seconds since the start of the current day/week/month/year",
+    so comparing the last reset epoch against the period start plus reset_time is enough.
+    """
+
+    day_start: int
+    week_start: int
+    month_start: int
+    year_start: int
+    day_seconds: int
+    week_seconds: int
+    month_seconds: int
+    year_seconds: int
+
+    @classmethod
+    def at(cls, now: datetime) -> "_ResetClock":
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_start = int(today.timestamp())
+        day_seconds = now.hour * 3600 + now.minute * 60 + now.second
+        return cls(
+            day_start=day_start,
+            week_start=day_start - now.weekday() * 86400,
+            month_start=int(today.replace(day=1).timestamp()),
+            year_start=int(today.replace(month=1, day=1).timestamp()),
+            day_seconds=day_seconds,
+            week_seconds=now.weekday() * 86400 + day_seconds,
+            month_seconds=(now.day - 1) * 86400 + day_seconds,
+            year_seconds=(now.timetuple().tm_yday - 1) * 86400 + day_seconds,
+        )
+
+
+def _day_reset_predicate(clock: _ResetClock, last_reset_epoch):
+    # reset_time is seconds of day (0-86400)
+    return and_(
+        Node.reset_time <= clock.day_seconds,
+        last_reset_epoch < clock.day_start + Node.reset_time,
+    )
+
+
+def _week_reset_predicate(clock: _ResetClock, last_reset_epoch):
+    # reset_time is day_of_week * 86400 + seconds (0-604800), at least 7 days since last reset
+    return and_(
+        Node.reset_time <= clock.week_seconds,
+        last_reset_epoch < clock.day_start - 6 * 86400,
+        or_(
+            last_reset_epoch < clock.day_start - 7 * 86400,
+            last_reset_epoch < clock.week_start - 7 * 86400 + Node.reset_time,
+        ),
+    )
+
+
+def _month_reset_predicate(clock: _ResetClock, last_reset_epoch):
+    # reset_time is day_of_month * 86400 + seconds, day capped at 28 to handle all months
+    month_offset = case(
+        (Node.reset_time >= 28 * 86400, 27 * 86400 + Node.reset_time % 86400),
+        else_=Node.reset_time - 86400,
+    )
+    return and_(
+        month_offset <= clock.month_seconds,
+        or_(
+            last_reset_epoch < clock.month_start,
+            last_reset_epoch < clock.month_start + month_offset,
+        ),
+    )
+
+
+def _year_reset_predicate(clock: _ResetClock, last_reset_epoch):
+    # reset_time is day_of_year * 86400 + seconds
+    year_offset = Node.reset_time - 86400
+    return and_(
+        year_offset <= clock.year_seconds,
+        or_(
+            last_reset_epoch < clock.year_start,
+            last_reset_epoch < clock.year_start + year_offset - Node.reset_time % 86400,
+        ),
+    )
+
+
+_TIME_BASED_RESET_PREDICATES = {
+    DataLimitResetStrategy.day: _day_reset_predicate,
+    DataLimitResetStrategy.week: _week_reset_predicate,
+    DataLimitResetStrategy.month: _month_reset_predicate,
+    DataLimitResetStrategy.year: _year_reset_predicate,
+}
+
+
 async def get_nodes_to_reset_usage(db: AsyncSession) -> list[Node]:
     """
     Retrieves nodes whose usage needs to be reset based on their reset strategy and reset_time.
     For reset_time == -1: Uses interval-based calculation (days since last reset)
     For reset_time >= 0: Uses absolute time calculation based on strategy
+
+    Both cases are evaluated in SQL, so only nodes that actually need a reset are returned.
     """
     last_reset_subq = (
         select(
@@ -605,148 +869,37 @@ async def get_nodes_to_reset_usage(db: AsyncSession) -> list[Node]:
     last_reset_time = coalesce(last_reset_subq.c.last_reset_at, Node.created_at)
 
     # For reset_time == -1: interval-based reset (similar to users)
-    reset_strategy_to_days = {
-        DataLimitResetStrategy.day: 1,
-        DataLimitResetStrategy.week: 7,
-        DataLimitResetStrategy.month: 30,
-        DataLimitResetStrategy.year: 365,
-    }
-
     num_days_to_reset_case = case(
-        *((Node.data_limit_reset_strategy == strategy, days) for strategy, days in reset_strategy_to_days.items()),
+        *((Node.data_limit_reset_strategy == strategy, days) for strategy, days in RESET_STRATEGY_TO_DAYS.items()),
         else_=None,
     )
 
-    # For reset_time >= 0: time-based reset
-    # This will be evaluated in Python after fetching candidates
-    # because the calculation is complex (encoded time values)
+    # For reset_time >= 0: time-based reset, one predicate per strategy
+    clock = _ResetClock.at(datetime.now(timezone.utc))
+    last_reset_epoch = Epoch(last_reset_time)
+    time_based_reset_case = case(
+        *(
+            (Node.data_limit_reset_strategy == strategy, predicate(clock, last_reset_epoch))
+            for strategy, predicate in _TIME_BASED_RESET_PREDICATES.items()
+        ),
+        else_=False,
+    )
 
     stmt = (
-        select(Node)
+        _build_node_select_stmt()
         .outerjoin(last_reset_subq, Node.id == last_reset_subq.c.node_id)
         .where(
             Node.status.in_([NodeStatus.connected, NodeStatus.limited, NodeStatus.error, NodeStatus.connecting]),
             Node.data_limit_reset_strategy != DataLimitResetStrategy.no_reset,
-            # For interval-based (-1), check if enough days have passed
-            # For time-based (>=0), we'll filter in Python
             case(
+                # For interval-based (-1), check if enough days have passed
                 (Node.reset_time == -1, DateDiff(func.now(), last_reset_time) >= num_days_to_reset_case),
-                else_=True,  # For time-based, fetch all candidates and filter in Python
+                else_=time_based_reset_case,
             ),
         )
     )
 
-    nodes = list((await db.execute(stmt)).unique().scalars().all())
-
-    # Load node attributes to avoid greenlet errors
-    for node in nodes:
-        await load_node_attrs(node)
-
-    # For nodes with reset_time >= 0, filter based on absolute time
-
-    filtered_nodes = []
-    for node in nodes:
-        if node.reset_time == -1:
-            # Already filtered by SQL query
-            filtered_nodes.append(node)
-        else:
-            # Time-based reset: check if current time matches the schedule
-            now = datetime.now(timezone.utc)
-
-            # Get last reset time
-            if node.usage_logs:
-                last_reset = max(log.created_at for log in node.usage_logs)
-            else:
-                last_reset = node.created_at
-
-            should_reset = False
-
-            if node.data_limit_reset_strategy == DataLimitResetStrategy.day:
-                # reset_time is seconds of day (0-86400)
-                current_seconds = now.hour * 3600 + now.minute * 60 + now.second
-                last_reset_seconds = last_reset.hour * 3600 + last_reset.minute * 60 + last_reset.second
-
-                # Reset if we've passed the reset_time today and last reset was before today's reset time
-                if current_seconds >= node.reset_time and (
-                    now.date() > last_reset.date() or last_reset_seconds < node.reset_time
-                ):
-                    should_reset = True
-
-            elif node.data_limit_reset_strategy == DataLimitResetStrategy.week:
-                # reset_time is day_of_week * 86400 + seconds (0-604800)
-                target_day = node.reset_time // 86400
-                target_seconds = node.reset_time % 86400
-
-                current_day = now.weekday()
-                current_seconds = now.hour * 3600 + now.minute * 60 + now.second
-                current_week_seconds = current_day * 86400 + current_seconds
-
-                last_reset_day = last_reset.weekday()
-                last_reset_seconds = last_reset.hour * 3600 + last_reset.minute * 60 + last_reset.second
-                last_reset_week_seconds = last_reset_day * 86400 + last_reset_seconds
-
-                # Check if enough time has passed (at least 7 days) and we're past the target time
-                days_diff = (now.date() - last_reset.date()).days
-                if (
-                    days_diff >= 7
-                    and current_week_seconds >= node.reset_time
-                    and (last_reset_week_seconds < node.reset_time or days_diff > 7)
-                ):
-                    should_reset = True
-
-            elif node.data_limit_reset_strategy == DataLimitResetStrategy.month:
-                # reset_time is day_of_month * 86400 + seconds
-                target_day = min(node.reset_time // 86400, 28)  # Max day 28 to handle all months
-                target_seconds = node.reset_time % 86400
-
-                current_day = now.day
-                current_seconds = now.hour * 3600 + now.minute * 60 + now.second
-
-                # Check if we're past the target day and time in current month
-                # and last reset was before this month's target time
-                if current_day > target_day or (current_day == target_day and current_seconds >= target_seconds):
-                    # Check if last reset was in a previous month or before target time this month
-                    if (
-                        now.year > last_reset.year
-                        or now.month > last_reset.month
-                        or (
-                            now.month == last_reset.month
-                            and (
-                                last_reset.day < target_day
-                                or (
-                                    last_reset.day == target_day
-                                    and last_reset.hour * 3600 + last_reset.minute * 60 + last_reset.second
-                                    < target_seconds
-                                )
-                            )
-                        )
-                    ):
-                        should_reset = True
-
-            elif node.data_limit_reset_strategy == DataLimitResetStrategy.year:
-                # reset_time is day_of_year * 86400 + seconds
-                target_day_of_year = node.reset_time // 86400
-                target_seconds = node.reset_time % 86400
-
-                current_day_of_year = now.timetuple().tm_yday
-                current_seconds = now.hour * 3600 + now.minute * 60 + now.second
-
-                last_reset_day_of_year = last_reset.timetuple().tm_yday
-
-                # Check if we're past the target day in current year
-                # and last reset was before this year's target time
-                if current_day_of_year > target_day_of_year or (
-                    current_day_of_year == target_day_of_year and current_seconds >= target_seconds
-                ):
-                    if now.year > last_reset.year or (
-                        now.year == last_reset.year and last_reset_day_of_year < target_day_of_year
-                    ):
-                        should_reset = True
-
-            if should_reset:
-                filtered_nodes.append(node)
-
-    return filtered_nodes
+    return list((await db.execute(stmt)).unique().scalars().all())
 
 
 async def reset_node_usage(db: AsyncSession, db_node: Node) -> Node:
@@ -760,6 +913,8 @@ async def reset_node_usage(db: AsyncSession, db_node: Node) -> Node:
     Returns:
         Node: The updated node object.
     """
+    _invalidate_node_cache(db, db_node)
+
     # Create usage log entry with current uplink and downlink
     usage_log = NodeUsageResetLogs(
         node_id=db_node.id,
@@ -792,25 +947,34 @@ async def bulk_reset_node_usage(db: AsyncSession, nodes: list[Node]) -> list[Nod
     Returns:
         list[Node]: The updated list of node objects.
     """
-    for db_node in nodes:
-        # Create usage log entry
-        usage_log = NodeUsageResetLogs(
-            node_id=db_node.id,
-            uplink=db_node.uplink,
-            downlink=db_node.downlink,
-        )
-        db.add(usage_log)
+    if not nodes:
+        return nodes
 
-        # Reset usage to zero
-        db_node.uplink = 0
-        db_node.downlink = 0
+    _invalidate_node_cache(db, *nodes)
+    node_ids = [db_node.id for db_node in nodes]
 
-        # Update status if was limited
-        if db_node.status == NodeStatus.limited:
-            db_node.status = NodeStatus.connecting
+    # Create usage log entries in a single executemany
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        insert(NodeUsageResetLogs),
+        [
+            {"node_id": db_node.id, "uplink": db_node.uplink, "downlink": db_node.downlink, "created_at": now}
+            for db_node in nodes
+        ],
+    )
 
+    # Reset usage to zero and move limited nodes back to connecting
+    await db.execute(
+        update(Node)
+        .where(Node.id.in_(node_ids))
+        .values(
+            uplink=0,
+            downlink=0,
+            status=case((Node.status == NodeStatus.limited, NodeStatus.connecting), else_=Node.status),
+        )
+        .execution_options(synchronize_session=False)
+    )
     await db.commit()
-    for node in nodes:
-        await db.refresh(node)
-        await load_node_attrs(node)
-    return nodes
+
+    stmt = _build_node_select_stmt().where(Node.id.in_(node_ids)).execution_options(populate_existing=True)
+    return list((await db.execute(stmt)).unique().scalars().all())
@@ -24,6 +24,14 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# PostgreSQL-only pg_trgm indexes created by revision 9d2b6e4f1a83; they can't be declared on the
+# models (other dialects have no gin_trgm_ops), so keep autogenerate from dropping them
+MIGRATION_ONLY_INDEXES = {"ix_nodes_name_trgm", "ix_nodes_api_key_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "index" and name in MIGRATION_ONLY_INDEXES)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -46,6 +54,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         render_as_batch=True,
         dialect_opts={"paramstyle": "named"},
@@ -54,7 +63,12 @@ def run_migrations_offline() -> None:
     with context.begin_transaction():
         context.run_migrations()
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=True,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
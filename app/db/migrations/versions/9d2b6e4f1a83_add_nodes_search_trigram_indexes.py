@@ -0,0 +1,62 @@
+"""add nodes search trigram indexes
+
+Revision ID: 9d2b6e4f1a83
+Revises: c3e8a1f47d25
+Create Date: 2026-10-15 07:41:09.372615
+
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9d2b6e4f1a83"
+down_revision = "c3e8a1f47d25"
+branch_labels = None
+depends_on = None
+
+
+# get_nodes searches name and api_key with ILIKE '%...%', which only trigram GIN indexes can serve
+TRGM_INDEXES = {
+    "ix_nodes_name_trgm": "name",
+    "ix_nodes_api_key_trgm": "api_key",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    try:
+        with bind.begin_nested():
+            bind.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except sa.exc.DBAPIError as exc:
+        # Without the extension (e.g. no privilege to create it) search keeps working, just unindexed
+        logging.getLogger("alembic.runtime.migration").warning(
+            "Could not create the pg_trgm extension (%s); node name/api_key search will not be indexed. "
+            "Create the extension and re-run this migration to add the trigram indexes.",
+            exc.orig,
+        )
+        return
+
+    for index_name, column in TRGM_INDEXES.items():
+        op.create_index(
+            index_name,
+            "nodes",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for index_name in TRGM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
@@ -0,0 +1,65 @@
+"""cascade node_stats delete
+
+Revision ID: c3e8a1f47d25
+Revises: f85c9f4bbdf7
+Create Date: 2026-10-15 07:02:44.513208
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = "c3e8a1f47d25"
+down_revision = "f85c9f4bbdf7"
+branch_labels = None
+depends_on = None
+
+FK_NAME = "fk_node_stats_node_id_nodes"
+
+
+def get_fk_name(table_name, column_names):
+    """Dynamically find the foreign key name for a given table and column(s)"""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    fks = inspector.get_foreign_keys(table_name)
+    for fk in fks:
+        if set(fk["constrained_columns"]) == set(column_names):
+            return fk["name"]
+    return None
+
+
+def _delete_orphan_stats() -> None:
+    """Delete node_stats rows that reference missing nodes so the FK can be recreated."""
+    node_stats = sa.table("node_stats", sa.column("node_id"))
+    nodes = sa.table("nodes", sa.column("id"))
+    op.execute(
+        sa.delete(node_stats).where(
+            ~sa.exists(sa.select(1).select_from(nodes).where(nodes.c.id == node_stats.c.node_id))
+        )
+    )
+
+
+def _replace_fk(ondelete) -> None:
+    fk_name = get_fk_name("node_stats", ["node_id"])
+
+    # SQLite needs batch operations, MySQL/PostgreSQL use direct operations
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("node_stats", schema=None) as batch_op:
+            if fk_name:
+                batch_op.drop_constraint(fk_name, type_="foreignkey")
+            batch_op.create_foreign_key(FK_NAME, "nodes", ["node_id"], ["id"], ondelete=ondelete)
+    else:
+        if fk_name:
+            op.drop_constraint(fk_name, "node_stats", type_="foreignkey")
+        op.create_foreign_key(FK_NAME, "node_stats", "nodes", ["node_id"], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _delete_orphan_stats()
+    _replace_fk("CASCADE")
+
+
+def downgrade() -> None:
+    _replace_fk(None)
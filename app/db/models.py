@@ -510,6 +510,10 @@ class NodeStatus(str, Enum):
 
 class Node(Base):
     __tablename__ = "nodes"
+    __table_args__ = (
+        # Index for the usage reset scheduler, which filters by status and reset strategy
+        Index("ix_nodes_status_data_limit_reset_strategy", "status", "data_limit_reset_strategy"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, init=False, autoincrement=True)
     created_at: Mapped[dt] = mapped_column(DateTime(timezone=True), default_factory=lambda: dt.now(tz.utc), init=False)
@@ -648,6 +652,22 @@ class NodeUsage(Base):
     downlink: Mapped[int] = mapped_column(BigInteger, default=0)
 
 
+class NodeUsageDaily(Base):
+    """Daily rollup of NodeUsage, maintained alongside it by the usage recorder."""
+
+    __tablename__ = "node_usages_daily"
+    __table_args__ = (
+        UniqueConstraint("created_at", "node_id"),
+        # The unique constraint already creates an index on (created_at, node_id)
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, init=False, autoincrement=True)
+    created_at: Mapped[dt] = mapped_column(DateTime(timezone=True), unique=False)  # 1 UTC day per record
+    node_id: Mapped[Optional[int]] = mapped_column(ForeignKey("nodes.id", ondelete="CASCADE"))
+    uplink: Mapped[int] = mapped_column(BigInteger, default=0)
+    downlink: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
 class NodeUsageResetLogs(Base):
     __tablename__ = "node_usage_reset_logs"
     __table_args__ = (
@@ -718,7 +738,7 @@ class NodeStat(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, init=False, autoincrement=True)
     created_at: Mapped[dt] = mapped_column(DateTime(timezone=True), default_factory=lambda: dt.now(tz.utc), init=False)
-    node_id: Mapped[int] = mapped_column(ForeignKey("nodes.id"))
+    node_id: Mapped[int] = mapped_column(ForeignKey("nodes.id", ondelete="CASCADE"))
     node: Mapped["Node"] = relationship(back_populates="stats", init=False)
     mem_total: Mapped[int] = mapped_column(BigInteger, unique=False, nullable=False)
     mem_used: Mapped[int] = mapped_column(BigInteger, unique=False, nullable=False)
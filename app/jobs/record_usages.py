@@ -18,7 +18,7 @@ from sqlalchemy.sql.expression import Insert
 from app import on_shutdown, scheduler
 from app.db import GetDB
 from app.db.base import engine
-from app.db.models import Admin, Node, NodeUsage, NodeUserUsage, System, User
+from app.db.models import Admin, Node, NodeUsage, NodeUsageDaily, NodeUserUsage, System, User
 from app.node import node_manager
 from app.utils.logger import get_logger
 from config import (
@@ -172,19 +172,24 @@ def build_node_user_usage_upsert(dialect: str, upsert_params: list[dict]):
         return [(insert_stmt, upsert_params), (update_stmt, update_params)]
 
 
-def build_node_usage_upsert(dialect: str, upsert_param: dict):
+def build_node_usage_upsert(
+    dialect: str,
+    upsert_param: dict,
+    model: type[NodeUsage] | type[NodeUsageDaily] = NodeUsage,
+):
     """
-    Build UPSERT statement for NodeUsage based on database dialect.
+    Build UPSERT statement for NodeUsage (or its NodeUsageDaily rollup) based on database dialect.
 
     Args:
         dialect: Database dialect name ('postgresql', 'mysql', or 'sqlite')
         upsert_param: Parameter dict with keys: node_id, created_at, up, down
+        model: Target table, NodeUsage or NodeUsageDaily
 
     Returns:
         tuple: (statements_list, params_list) - For SQLite returns 2 statements, others return 1
     """
     if dialect == "postgresql":
-        stmt = pg_insert(NodeUsage).values(
+        stmt = pg_insert(model).values(
             node_id=bindparam("node_id"),
             created_at=bindparam("created_at"),
             uplink=bindparam("up"),
@@ -193,29 +198,29 @@ def build_node_usage_upsert(dialect: str, upsert_param: dict):
         stmt = stmt.on_conflict_do_update(
             index_elements=["created_at", "node_id"],
             set_={
-                "uplink": NodeUsage.uplink + bindparam("up"),
-                "downlink": NodeUsage.downlink + bindparam("down"),
+                "uplink": model.uplink + bindparam("up"),
+                "downlink": model.downlink + bindparam("down"),
             },
         )
         return [(stmt, [upsert_param])]
 
     elif dialect == "mysql":
-        stmt = mysql_insert(NodeUsage).values(
+        stmt = mysql_insert(model).values(
             node_id=bindparam("node_id"),
             created_at=bindparam("created_at"),
             uplink=bindparam("up"),
             downlink=bindparam("down"),
         )
         stmt = stmt.on_duplicate_key_update(
-            uplink=NodeUsage.uplink + stmt.inserted.uplink,
-            downlink=NodeUsage.downlink + stmt.inserted.downlink,
+            uplink=model.uplink + stmt.inserted.uplink,
+            downlink=model.downlink + stmt.inserted.downlink,
         )
         return [(stmt, [upsert_param])]
 
     else:  # SQLite
         # Insert with OR IGNORE
         insert_stmt = (
-            insert(NodeUsage)
+            insert(model)
             .values(
                 node_id=bindparam("node_id"),
                 created_at=bindparam("created_at"),
@@ -227,15 +232,15 @@ def build_node_usage_upsert(dialect: str, upsert_param: dict):
 
         # Update with renamed bindparams to avoid conflicts
         update_stmt = (
-            update(NodeUsage)
+            update(model)
             .values(
-                uplink=NodeUsage.uplink + bindparam("up"),
-                downlink=NodeUsage.downlink + bindparam("down"),
+                uplink=model.uplink + bindparam("up"),
+                downlink=model.downlink + bindparam("down"),
             )
             .where(
                 and_(
-                    NodeUsage.node_id == bindparam("b_node_id"),
-                    NodeUsage.created_at == bindparam("b_created_at"),
+                    model.node_id == bindparam("b_node_id"),
+                    model.created_at == bindparam("b_created_at"),
                 )
             )
         )
@@ -264,23 +269,38 @@ async def safe_execute(stmt, params=None, max_retries: int = 2):
         params (list[dict], optional): Parameters for the statement
         max_retries (int, optional): Maximum number of retry attempts (default: 2)
     """
-    statement = stmt
+    await safe_execute_many([(stmt, params)], max_retries)
 
+
+async def safe_execute_many(queries: list[tuple], max_retries: int = 2):
+    """
+    Like safe_execute, but runs several (statement, params) pairs in a single transaction,
+    so they are committed or dropped together.
+
+    Args:
+        queries: (statement, params) pairs, params may be None
+        max_retries (int, optional): Maximum number of retry attempts (default: 2)
+    """
     # Get dialect once before retry loop to avoid repeated DB calls
     dialect = await get_dialect()
-    if dialect == "mysql" and isinstance(stmt, Insert):
-        # MySQL-specific IGNORE prefix - but skip if using ON DUPLICATE KEY UPDATE
-        if not hasattr(stmt, "_post_values_clause") or stmt._post_values_clause is None:
-            statement = stmt.prefix_with("IGNORE")
+
+    statements = []
+    for stmt, params in queries:
+        if dialect == "mysql" and isinstance(stmt, Insert):
+            # MySQL-specific IGNORE prefix - but skip if using ON DUPLICATE KEY UPDATE
+            if not hasattr(stmt, "_post_values_clause") or stmt._post_values_clause is None:
+                stmt = stmt.prefix_with("IGNORE")
+        statements.append((stmt, params))
 
     for attempt in range(max_retries):
         try:
             # engine.begin() ensures commit/rollback + connection return on exit
             async with engine.begin() as conn:
-                if params is None:
-                    await conn.execute(statement)
-                else:
-                    await conn.execute(statement, params)
+                for statement, params in statements:
+                    if params is None:
+                        await conn.execute(statement)
+                    else:
+                        await conn.execute(statement, params)
                 return
 
         except (OperationalError, DatabaseError) as err:
@@ -335,6 +355,19 @@ def _get_time_bucket(now: dt = None) -> dt:
     return now.replace(minute=(now.minute // 10) * 10, second=0, microsecond=0)
 
 
+def _get_day_bucket(bucket: dt) -> dt:
+    """
+    Get the UTC day bucket used by the NodeUsageDaily rollup.
+
+    Args:
+        bucket: 10-minute bucket returned by _get_time_bucket
+
+    Returns:
+        datetime rounded down to midnight
+    """
+    return bucket.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
 async def record_user_stats_batched(all_node_params: dict, usage_coefficients: dict):
     """
     Record user statistics for ALL nodes in a single batched UPSERT operation.
@@ -389,6 +422,7 @@ async def record_node_stats_batched(all_node_params: dict):
         return
 
     created_at = _get_time_bucket()
+    day_created_at = _get_day_bucket(created_at)
     dialect = await get_dialect()
 
     # Process each node's stats with concurrency control
@@ -410,11 +444,14 @@ async def record_node_stats_batched(all_node_params: dict):
             "down": total_down,
         }
 
+        # Keep the daily rollup in step with the raw usage table, both are written in one transaction
+        daily_upsert_param = {**upsert_param, "created_at": day_created_at}
+
         # Execute with concurrency control
         async with JOB_SEM:
             queries = build_node_usage_upsert(dialect, upsert_param)
-            for stmt, stmt_params in queries:
-                await safe_execute(stmt, stmt_params)
+            queries += build_node_usage_upsert(dialect, daily_upsert_param, NodeUsageDaily)
+            await safe_execute_many(queries)
 
     # Execute all node stats with limited concurrency
     tasks = [_record_single_node(node_id, params) for node_id, params in all_node_params.items()]
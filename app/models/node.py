@@ -1,5 +1,6 @@
 import re
 from enum import Enum
+from functools import lru_cache
 from ipaddress import ip_address
 from uuid import UUID
 
@@ -11,12 +12,33 @@ from app.db.models import DataLimitResetStrategy, NodeConnectionType, NodeStatus
 # Basic PEM format validation
 CERT_PATTERN = r"-----BEGIN CERTIFICATE-----(.*?)-----END CERTIFICATE-----"
 KEY_PATTERN = r"-----BEGIN (?:RSA )?PRIVATE KEY-----"
+_CERT_RE = re.compile(CERT_PATTERN, re.DOTALL)
+_KEY_RE = re.compile(KEY_PATTERN)
+_DOMAIN_RE = re.compile(r"^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,14}$")
 
 SECONDS_IN_DAY = 86400
 SECONDS_IN_WEEK = 604800
 SECONDS_IN_MONTH = 2678400  # 31 days
 SECONDS_IN_YEAR = 31536000  # 365 days
 
+# Exclusive upper bound of reset_time for each strategy
+RESET_TIME_MAX_VALUES = {
+    DataLimitResetStrategy.day: SECONDS_IN_DAY,
+    DataLimitResetStrategy.week: SECONDS_IN_WEEK,
+    DataLimitResetStrategy.month: SECONDS_IN_MONTH,
+    DataLimitResetStrategy.year: SECONDS_IN_YEAR,
+}
+
+
+@lru_cache(maxsize=256)
+def _is_valid_certificate(pem: bytes) -> bool:
+    """Parse a PEM certificate once per distinct input, repeated validations hit the cache."""
+    try:
+        load_pem_x509_certificate(pem)
+    except Exception:
+        return False
+    return True
+
 
 class UsageTable(str, Enum):
     node_user_usages = "node_user_usages"
@@ -73,14 +95,16 @@ class NodeCreate(Node):
     def validate_address(cls, v: str) -> str:
         if not v:
             return v
-        try:
-            ip_address(v)
-            return v
-        except ValueError:
-            # Regex for domain validation
-            if re.match(r"^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,14}$", v):
+        # Only IPv6 contains ":" and only IPv4 is all digits and dots, anything else can skip ip_address()
+        if ":" in v or v.replace(".", "").isdigit():
+            try:
+                ip_address(v)
                 return v
-            raise ValueError("Invalid address format, must be a valid IPv4/IPv6 or domain")
+            except ValueError:
+                pass
+        elif _DOMAIN_RE.match(v):
+            return v
+        raise ValueError("Invalid address format, must be a valid IPv4/IPv6 or domain")
 
     @field_validator("port")
     @classmethod
@@ -100,20 +124,17 @@ class NodeCreate(Node):
         v = v.strip()
 
         # Check for PEM certificate format
-        if not re.search(CERT_PATTERN, v, re.DOTALL):
+        if not _CERT_RE.search(v):
             raise ValueError("Invalid certificate format - must contain PEM certificate blocks")
 
         # Check for private key material
-        if re.search(KEY_PATTERN, v):
+        if _KEY_RE.search(v):
             raise ValueError("Certificate contains private key material")
 
         if len(v) > 2048:
             raise ValueError("Certificate too large (max 2048 characters)")
 
-        try:
-            load_pem_x509_certificate(v.encode("utf-8"))
-            pass
-        except Exception:
+        if not _is_valid_certificate(v.encode("utf-8")):
             raise ValueError("Invalid certificate structure")
 
         return v
@@ -138,15 +159,7 @@ class NodeCreate(Node):
         if self.data_limit_reset_strategy == DataLimitResetStrategy.no_reset or self.reset_time == -1:
             return self
 
-        # Define max values for each strategy
-        max_values = {
-            DataLimitResetStrategy.day: SECONDS_IN_DAY,
-            DataLimitResetStrategy.week: SECONDS_IN_WEEK,
-            DataLimitResetStrategy.month: SECONDS_IN_MONTH,
-            DataLimitResetStrategy.year: SECONDS_IN_YEAR,
-        }
-
-        max_value = max_values.get(self.data_limit_reset_strategy)
+        max_value = RESET_TIME_MAX_VALUES.get(self.data_limit_reset_strategy)
         if max_value and self.reset_time >= max_value:
             raise ValueError(
                 f"reset_time must be less than {max_value} for {self.data_limit_reset_strategy.value} strategy, "
@@ -5,10 +5,30 @@ Broken down into small, focused models - each transport/protocol gets only what
 
 from __future__ import annotations
 
-from typing import Any
+import json
+from functools import cached_property
+from typing import Any, ClassVar
 
 from pydantic import BaseModel, Field, computed_field
 
+from app.utils.helpers import remove_empty_values
+
+# TLSConfig fields read by link_entries; sni and reality_short_id are set per user in share.py and are not among them
+_TLS_LINK_ENTRY_FIELDS = frozenset(
+    {
+        "tls",
+        "fingerprint",
+        "allowinsecure",
+        "alpn_list",
+        "ech_config_list",
+        "pinned_peer_cert_sha256",
+        "verify_peer_cert_by_name",
+        "reality_public_key",
+        "reality_spx",
+        "mldsa65_verify",
+    }
+)
+
 
 class TLSConfig(BaseModel):
     """TLS configuration - only TLS-related fields"""
@@ -53,6 +73,49 @@ class TLSConfig(BaseModel):
         """Alias for allowinsecure"""
         return self.allowinsecure
 
+    @cached_property
+    def vcn_str(self) -> str:
+        """verify_peer_cert_by_name as the comma-separated string used by links and xray, joined once per TLS config"""
+        return ",".join(self.verify_peer_cert_by_name) if self.verify_peer_cert_by_name else ""
+
+    @cached_property
+    def link_entries(self) -> tuple[tuple[str, Any], ...]:
+        """
+        Share-link TLS query entries, built with the host config and rebuilt only when one of their fields changes.
+        sni and reality_short_id are picked per user, so they are left out
+        ("sid" is only a placeholder keeping its position in the query).
+        """
+        entries = [
+            ("fp", self.fingerprint),
+            ("pcs", self.pinned_peer_cert_sha256),
+            ("vcn", self.vcn_str),
+        ]
+        if self.alpn_links:
+            entries.append(("alpn", self.alpn_links))
+        if self.ech_config_list:
+            entries.append(("ech", self.ech_config_list))
+        if self.tls == "reality":
+            entries.append(("pbk", self.reality_public_key))
+            entries.append(("sid", ""))
+            if self.reality_spx:
+                entries.append(("spx", self.reality_spx))
+            if self.mldsa65_verify:
+                entries.append(("pqv", self.mldsa65_verify))
+        if self.allowinsecure:
+            entries.append(("allowInsecure", 1))
+        return tuple(entries)
+
+    def model_post_init(self, context: Any) -> None:
+        # Build the entries on the shared host config so the per-user deepcopies in share.py carry them along
+        _ = self.link_entries
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in _TLS_LINK_ENTRY_FIELDS:
+            self.__dict__.pop("link_entries", None)
+            if name == "verify_peer_cert_by_name":
+                self.__dict__.pop("vcn_str", None)
+
     model_config = {"validate_assignment": True}
 
 
@@ -71,6 +134,8 @@ class BaseTransportConfig(BaseModel):
 class GRPCTransportConfig(BaseTransportConfig):
     """GRPC/Gun transport - only grpc-specific fields"""
 
+    header_type: ClassVar[str] = "none"
+
     multi_mode: bool = Field(False, serialization_alias="multiMode")
     idle_timeout: int | None = Field(None)
     health_check_timeout: int | None = Field(None)
@@ -83,14 +148,45 @@ class GRPCTransportConfig(BaseTransportConfig):
 class WebSocketTransportConfig(BaseTransportConfig):
     """WebSocket transport - only ws-specific fields"""
 
+    header_type: ClassVar[str] = "none"
+
     heartbeat_period: int | None = Field(None, serialization_alias="heartbeatPeriod")
     http_headers: dict[str, str] | None = Field(None)
     random_user_agent: bool = Field(False)
 
 
+# (share-link extra key, XHTTPTransportConfig attribute) for the scalar xhttp extra fields, in output order
+_XHTTP_LINK_EXTRA_FIELDS = (
+    ("scMaxEachPostBytes", "sc_max_each_post_bytes"),
+    ("scMinPostsIntervalMs", "sc_min_posts_interval_ms"),
+    ("xPaddingBytes", "x_padding_bytes"),
+    ("xPaddingObfsMode", "x_padding_obfs_mode"),
+    ("xPaddingKey", "x_padding_key"),
+    ("xPaddingHeader", "x_padding_header"),
+    ("xPaddingPlacement", "x_padding_placement"),
+    ("xPaddingMethod", "x_padding_method"),
+    ("uplinkHTTPMethod", "uplink_http_method"),
+    ("sessionPlacement", "session_placement"),
+    ("sessionKey", "session_key"),
+    ("seqPlacement", "seq_placement"),
+    ("seqKey", "seq_key"),
+    ("uplinkDataPlacement", "uplink_data_placement"),
+    ("uplinkDataKey", "uplink_data_key"),
+    ("uplinkChunkSize", "uplink_chunk_size"),
+    ("noGRPCHeader", "no_grpc_header"),
+)
+
+# XHTTPTransportConfig fields read by link_extra; host, path and download_settings are set per user in share.py
+_XHTTP_LINK_EXTRA_INPUTS = frozenset(
+    {attr for _, attr in _XHTTP_LINK_EXTRA_FIELDS} | {"xmux", "http_headers", "random_user_agent"}
+)
+
+
 class XHTTPTransportConfig(BaseTransportConfig):
     """xHTTP/SplitHTTP transport - only xhttp-specific fields"""
 
+    header_type: ClassVar[str] = "none"
+
     mode: str = Field("auto")
     no_grpc_header: bool | None = Field(None)
     sc_max_each_post_bytes: str | int | None = Field(
@@ -118,10 +214,39 @@ class XHTTPTransportConfig(BaseTransportConfig):
     http_headers: dict[str, str] | None = Field(None)
     random_user_agent: bool = Field(False)
 
+    @cached_property
+    def link_extra(self) -> tuple[str, dict[str, str]]:
+        """
+        Share-link `extra` parts that don't depend on the user: the pre-serialized JSON members, and the headers
+        still waiting for a random User-Agent (empty when they are already serialized).
+        Built with the host config and rebuilt only when one of their fields changes; downloadSettings is resolved per user.
+        """
+        extra = {
+            key: value for key, attr in _XHTTP_LINK_EXTRA_FIELDS if (value := getattr(self, attr)) not in (None, "", 0)
+        }
+        if self.xmux and (xmux := remove_empty_values(self.xmux)):
+            extra["xmux"] = xmux
+        headers = remove_empty_values(self.http_headers) if self.http_headers else {}
+        if headers and not self.random_user_agent:
+            extra["headers"] = headers
+            headers = {}
+        return json.dumps(extra, separators=(",", ":"))[1:-1], headers
+
+    def model_post_init(self, context: Any) -> None:
+        # Serialize on the shared host config so the per-user deepcopies in share.py carry it along
+        _ = self.link_extra
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in _XHTTP_LINK_EXTRA_INPUTS:
+            self.__dict__.pop("link_extra", None)
+
 
 class KCPTransportConfig(BaseTransportConfig):
     """KCP transport - only kcp-specific fields"""
 
+    header_type: ClassVar[str] = "none"
+
     mtu: int | None = Field(None)
     tti: int | None = Field(None)
     uplink_capacity: int | None = Field(None)
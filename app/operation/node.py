@@ -44,6 +44,7 @@ from app.models.stats import NodeRealtimeStats, NodeStatsList, NodeUsageStatsLis
 from app.nats.node_rpc import node_nats_client
 from app.node import calculate_max_message_size, core_users, node_manager
 from app.operation import BaseOperation, OperatorType
+from app.utils.helpers import ensure_datetime_timezone
 from app.utils.logger import get_logger
 from config import ROLE
 
@@ -474,6 +475,12 @@ class NodeOperation(BaseOperation):
     async def clear_usage_data(
         self, db: AsyncSession, table: UsageTable, start: dt | None = None, end: dt | None = None
     ):
+        # Naive inputs are treated as UTC once here, the CRUD layer only converts to UTC
+        if start:
+            start = ensure_datetime_timezone(start)
+        if end:
+            end = ensure_datetime_timezone(end)
+
         if start and end and start >= end:
             await self.raise_error(code=400, message="Start time must be before end time.")
 
@@ -2,13 +2,15 @@ import base64
 import hashlib
 import json
 import re
-from enum import Enum
 
 from app.templates import render_template
+from app.utils.helpers import remove_empty_values
 from config import GRPC_USER_AGENT_TEMPLATE, USER_AGENT_TEMPLATE
 
 
 class BaseSubscription:
+    __slots__ = ("grpc_user_agent_data", "proxy_remarks", "user_agent_list")
+
     def __init__(self):
         self.proxy_remarks = []
         user_agent_data = json.loads(render_template(USER_AGENT_TEMPLATE))
@@ -47,22 +49,7 @@ class BaseSubscription:
         Returns:
             Cleaned dictionary with empty values removed
         """
-
-        def clean_dict(d: dict) -> dict:
-            new_dict = {}
-            for k, v in d.items():
-                if v not in (None, "", 0):
-                    if isinstance(v, dict):
-                        if cleaned_dict := clean_dict(v):
-                            new_dict[k] = cleaned_dict
-                    else:
-                        if isinstance(v, Enum):
-                            new_dict[k] = v.value
-                        else:
-                            new_dict[k] = v
-            return new_dict
-
-        return clean_dict(data)
+        return remove_empty_values(data)
 
     def snake_to_camel(self, snake_str):
         return re.sub(r"_([a-z])", lambda match: match.group(1).upper(), snake_str)
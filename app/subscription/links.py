@@ -1,12 +1,15 @@
-import base64
+import binascii
 import json
+import re
 import urllib.parse as urlparse
+from collections import deque
+from enum import Enum
+from functools import lru_cache
 from random import choice
 from urllib.parse import quote
 
 from app.models.subscription import (
     GRPCTransportConfig,
-    KCPTransportConfig,
     QUICTransportConfig,
     SubscriptionInboundData,
     TCPTransportConfig,
@@ -18,66 +21,74 @@ from config import EXTERNAL_CONFIG
 
 from . import BaseSubscription
 
+# Characters quote(path, safe="-_.!~*'()") would escape; note "/" is not in that safe set
+_GRPC_PATH_UNSAFE = re.compile(r"[^A-Za-z0-9\-_.!~*'()]")
+
+
+@lru_cache(maxsize=4096)
+def _quote_query_value(value: str) -> str:
+    """Encode a query value like urlencode does; security/type/fp values repeat across almost every link."""
+    return urlparse.quote_plus(value)
+
+
+@lru_cache(maxsize=4096)
+def _quote_remark(remark: str) -> str:
+    """Encode a link fragment once per distinct remark; hosts often share one remark across many links."""
+    return urlparse.quote(remark)
+
+
+@lru_cache(maxsize=256)
+def _link_template(
+    protocol: str, network: str, tls: str | None, header_type: str, encryption: str
+) -> tuple[tuple[str, str | None], ...]:
+    """Per-protocol payload keys that only depend on the inbound shape, shared by every user"""
+    if protocol == "vmess":
+        return (("aid", "0"), ("net", network), ("scy", "auto"), ("tls", tls), ("type", header_type), ("v", "2"))
+    if protocol == "vless":
+        return (("encryption", encryption), ("security", tls), ("type", network), ("headerType", header_type))
+    return (("security", tls), ("type", network), ("headerType", header_type))
+
 
 class StandardLinks(BaseSubscription):
+    __slots__ = ("_grpc_user_agents", "_user_agents", "links")
+
     def __init__(self):
         super().__init__()
-        self.links = []
-
-        # Registry pattern for transport handlers
-        self.transport_handlers = {
-            "grpc": self._transport_grpc,
-            "gun": self._transport_grpc,
-            "splithttp": self._transport_xhttp,
-            "xhttp": self._transport_xhttp,
-            "ws": self._transport_ws,
-            "httpupgrade": self._transport_httpupgrade,
-            "quic": self._transport_quic,
-            "kcp": self._transport_kcp,
-            "tcp": self._transport_tcp,
-            "raw": self._transport_tcp,
-            "http": self._transport_tcp,
-            "h2": self._transport_tcp,
-        }
-
-        # Registry pattern for protocol handlers
-        self.protocol_handlers = {
-            "vmess": self._build_vmess,
-            "vless": self._build_vless,
-            "trojan": self._build_trojan,
-            "shadowsocks": self._build_shadowsocks,
-        }
-
-    def add_link(self, link):
+        self.links: deque[str] = deque()
+        self._user_agents = tuple(self.user_agent_list)
+        self._grpc_user_agents = tuple(self.grpc_user_agent_data)
+
+    def add_link(self, link: str) -> None:
         self.links.append(link)
 
-    def render(self, reverse=False):
+    def render(self, reverse: bool = False) -> str:
+        links = reversed(self.links) if reverse else self.links
         if EXTERNAL_CONFIG:
-            self.links.append(EXTERNAL_CONFIG)
-        if reverse:
-            self.links.reverse()
-        return "\n".join((self.links))
-
-    def add(self, remark: str, address: str, inbound: SubscriptionInboundData, settings: dict):
-        """
-        Add a proxy link using registry pattern.
-        No if/else chains - just lookup the handler and call it.
-        """
-        # Get protocol handler from registry
-        handler = self.protocol_handlers.get(inbound.protocol)
-        if not handler:
-            return
-
-        # Call the handler
-        link = handler(remark=remark, address=address, inbound=inbound, settings=settings)
+            links = (EXTERNAL_CONFIG, *links) if reverse else (*links, EXTERNAL_CONFIG)
+        return "\n".join(links)
+
+    def add(self, remark: str, address: str, inbound: SubscriptionInboundData, settings: dict) -> None:
+        """Add a proxy link, dispatching on the inbound protocol"""
+        match inbound.protocol:
+            case "vmess":
+                link = self._build_vmess(remark, address, inbound, settings)
+            case "vless":
+                link = self._build_vless(remark, address, inbound, settings)
+            case "trojan":
+                link = self._build_trojan(remark, address, inbound, settings)
+            case "shadowsocks":
+                link = self._build_shadowsocks(remark, address, inbound, settings)
+            case _:
+                return
+
         if link:
             self.add_link(link)
 
     # ========== Transport Handlers (Only receive what they need) ==========
 
-    def _transport_grpc(self, payload: dict, protocol: str, config: GRPCTransportConfig, path: str):
+    def _transport_grpc(self, payload: dict, protocol: str, config: GRPCTransportConfig, path: str) -> None:
         """Handle grpc/gun transport - only gets GRPC config"""
-        host = config.host if isinstance(config.host, str) else ""
+        host = config.host
 
         if protocol == "vmess":
             payload["type"] = "multi" if config.multi_mode else "gun"
@@ -86,9 +97,9 @@ class StandardLinks(BaseSubscription):
             payload["authority"] = host
             payload["mode"] = "multi" if config.multi_mode else "gun"
 
-    def _transport_xhttp(self, payload: dict, protocol: str, config: XHTTPTransportConfig, path: str):
+    def _transport_xhttp(self, payload: dict, protocol: str, config: XHTTPTransportConfig, path: str) -> None:
         """Handle splithttp/xhttp transport - only gets xHTTP config"""
-        host = config.host if isinstance(config.host, str) else ""
+        host = config.host
         payload["path"] = path
         payload["host"] = host
 
@@ -97,88 +108,82 @@ class StandardLinks(BaseSubscription):
         else:
             payload["mode"] = config.mode
 
-        extra = {
-            "scMaxEachPostBytes": config.sc_max_each_post_bytes,
-            "scMinPostsIntervalMs": config.sc_min_posts_interval_ms,
-            "xPaddingBytes": config.x_padding_bytes,
-            "xPaddingObfsMode": config.x_padding_obfs_mode,
-            "xPaddingKey": config.x_padding_key,
-            "xPaddingHeader": config.x_padding_header,
-            "xPaddingPlacement": config.x_padding_placement,
-            "xPaddingMethod": config.x_padding_method,
-            "uplinkHTTPMethod": config.uplink_http_method,
-            "sessionPlacement": config.session_placement,
-            "sessionKey": config.session_key,
-            "seqPlacement": config.seq_placement,
-            "seqKey": config.seq_key,
-            "uplinkDataPlacement": config.uplink_data_placement,
-            "uplinkDataKey": config.uplink_data_key,
-            "uplinkChunkSize": config.uplink_chunk_size,
-            "noGRPCHeader": config.no_grpc_header,
-            "xmux": config.xmux,
-            "headers": config.http_headers if config.http_headers else {},
-            "downloadSettings": config.download_settings,
-        }
+        # Everything but the random User-Agent and the per-user downloadSettings is serialized once per host
+        static_members, headers = config.link_extra
+        members = [static_members] if static_members else []
 
         if config.random_user_agent:
             if config.mode in ("stream-one", "stream-up") and not config.no_grpc_header:
-                extra["headers"]["User-Agent"] = choice(self.grpc_user_agent_data)
+                user_agents = self._grpc_user_agents
             else:
-                extra["headers"]["User-Agent"] = choice(self.user_agent_list)
-
-        extra = self._normalize_and_remove_none_values(extra)
-        if extra:
-            payload["extra"] = json.dumps(extra).replace(" ", "")
-
-    def _transport_ws(self, payload: dict, protocol: str, config: WebSocketTransportConfig, path: str):
+                user_agents = self._user_agents
+            if user_agent := choice(user_agents):
+                headers = {**headers, "User-Agent": user_agent}
+            if headers:
+                members.append('"headers":' + json.dumps(headers, separators=(",", ":")))
+
+        download_settings = config.download_settings
+        if isinstance(download_settings, dict):
+            download_settings = self._normalize_and_remove_none_values(download_settings)
+        if download_settings:
+            members.append('"downloadSettings":' + json.dumps(download_settings, separators=(",", ":")))
+
+        if members:
+            payload["extra"] = "{" + ",".join(members) + "}"
+
+    def _transport_ws(self, payload: dict, protocol: str, config: WebSocketTransportConfig, path: str) -> None:
         """Handle websocket transport - only gets WS config"""
-        host = config.host if isinstance(config.host, str) else ""
+        host = config.host
         if config.heartbeat_period:
             payload["heartbeatPeriod"] = config.heartbeat_period
         payload["path"] = path
         payload["host"] = host
 
-    def _transport_httpupgrade(self, payload: dict, protocol: str, config: WebSocketTransportConfig, path: str):
+    def _transport_httpupgrade(self, payload: dict, protocol: str, config: WebSocketTransportConfig, path: str) -> None:
         """Handle httpupgrade transport - only gets HTTPUPGRADE config"""
-        host = config.host if isinstance(config.host, str) else ""
+        host = config.host
         payload["path"] = path
         payload["host"] = host
 
-    def _transport_quic(self, payload: dict, protocol: str, config: QUICTransportConfig, path: str):
+    def _transport_quic(self, payload: dict, protocol: str, config: QUICTransportConfig, path: str) -> None:
         """Handle quic transport - only gets QUIC config"""
         if protocol != "vmess":
-            host = config.host if isinstance(config.host, str) else ""
+            host = config.host
             payload["key"] = path
             payload["quicSecurity"] = host
 
-    def _transport_kcp(self, payload: dict, protocol: str, config: KCPTransportConfig, path: str):
-        """Handle kcp transport - only gets KCP config"""
-        # KCP header/seed are removed in latest Xray-core; no extra fields needed.
-
-    def _transport_tcp(self, payload: dict, protocol: str, config: TCPTransportConfig, path: str):
+    def _transport_tcp(self, payload: dict, protocol: str, config: TCPTransportConfig, path: str) -> None:
         """Handle tcp/raw/http transport - only gets TCP config"""
-        host = config.host if isinstance(config.host, str) else ""
+        host = config.host
         payload["path"] = path
         payload["host"] = host
 
-    def _apply_transport_settings(self, payload: dict, protocol: str, inbound: SubscriptionInboundData, path: str):
+    def _apply_transport_settings(
+        self, payload: dict, protocol: str, inbound: SubscriptionInboundData, path: str
+    ) -> None:
         """Apply transport settings - uses pre-created config instance"""
-        handler = self.transport_handlers.get(inbound.network)
-        if handler:
-            # Just use the stored instance, no extraction needed!
-            handler(payload, protocol, inbound.transport_config, path)
-
-    def _apply_tls_settings(self, payload: dict, tls_config: TLSConfig, fragment_settings: dict | None = None):
+        config = inbound.transport_config
+        match inbound.network:
+            case "grpc" | "gun":
+                self._transport_grpc(payload, protocol, config, path)
+            case "splithttp" | "xhttp":
+                self._transport_xhttp(payload, protocol, config, path)
+            case "ws":
+                self._transport_ws(payload, protocol, config, path)
+            case "httpupgrade":
+                self._transport_httpupgrade(payload, protocol, config, path)
+            case "quic":
+                self._transport_quic(payload, protocol, config, path)
+            case "tcp" | "raw" | "http" | "h2":
+                self._transport_tcp(payload, protocol, config, path)
+            # kcp: header/seed are removed in latest Xray-core; no extra fields needed
+
+    def _apply_tls_settings(self, payload: dict, tls_config: TLSConfig, fragment_settings: dict | None = None) -> None:
         """Apply TLS settings - receives TLS config and optional fragment settings"""
-        sni = tls_config.sni if isinstance(tls_config.sni, str) else ""
-        payload["sni"] = sni
-        payload["fp"] = tls_config.fingerprint
-        payload["pcs"] = tls_config.pinned_peer_cert_sha256
-        payload["vcn"] = ",".join(tls_config.verify_peer_cert_by_name) if tls_config.verify_peer_cert_by_name else ""
-
-        # Use pre-formatted alpn for links (comma-separated string)
-        if tls_config.alpn_links:
-            payload["alpn"] = tls_config.alpn_links
+        payload["sni"] = tls_config.sni
+        payload.update(tls_config.link_entries)
+        if tls_config.tls == "reality":
+            payload["sid"] = tls_config.reality_short_id
 
         # Fragment settings (from inbound, not TLS)
         if fragment_settings:
@@ -187,19 +192,16 @@ class StandardLinks(BaseSubscription):
                     f"{xray_fragment['length']},{xray_fragment['interval']},{xray_fragment['packets']}"
                 )
 
-        if tls_config.ech_config_list:
-            payload["ech"] = tls_config.ech_config_list
-
-        if tls_config.tls == "reality":
-            payload["pbk"] = tls_config.reality_public_key
-            payload["sid"] = tls_config.reality_short_id
-            if tls_config.reality_spx:
-                payload["spx"] = tls_config.reality_spx
-            if tls_config.mldsa65_verify:
-                payload["pqv"] = tls_config.mldsa65_verify
-
-        if tls_config.allowinsecure:
-            payload["allowInsecure"] = 1
+    def _get_link_template(self, protocol: str, inbound: SubscriptionInboundData) -> dict:
+        """Return a fresh copy of the cached non-user-specific payload for this protocol and inbound shape"""
+        template = _link_template(
+            protocol,
+            inbound.network,
+            inbound.tls_config.tls,
+            inbound.transport_config.header_type,
+            inbound.encryption,
+        )
+        return dict(template)
 
     # ========== Protocol Builders ==========
 
@@ -207,22 +209,15 @@ class StandardLinks(BaseSubscription):
         """Build VMess link"""
         # Process grpc path
         path = self._process_path(inbound)
-        host = inbound.transport_config.host if isinstance(inbound.transport_config.host, str) else ""
-
-        payload = {
-            "add": address,
-            "aid": "0",
-            "host": host,
-            "id": str(settings["id"]),
-            "net": inbound.network,
-            "path": path,
-            "port": inbound.port,
-            "ps": remark,
-            "scy": "auto",
-            "tls": inbound.tls_config.tls,
-            "type": getattr(inbound.transport_config, "header_type", "none"),
-            "v": "2",
-        }
+        host = inbound.transport_config.host
+
+        payload = self._get_link_template("vmess", inbound)
+        payload["add"] = address
+        payload["host"] = host
+        payload["id"] = str(settings["id"])
+        payload["path"] = path
+        payload["port"] = inbound.port
+        payload["ps"] = remark
 
         self._apply_transport_settings(payload, "vmess", inbound, path)
 
@@ -230,8 +225,8 @@ class StandardLinks(BaseSubscription):
             # Use stored TLS config instance
             self._apply_tls_settings(payload, inbound.tls_config, inbound.fragment_settings)
 
-        payload = self._normalize_and_remove_none_values(payload)
-        return "vmess://" + base64.b64encode(json.dumps(payload, sort_keys=True).encode("utf-8")).decode()
+        encoded = json.dumps(self._compact_payload(payload), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return "vmess://" + binascii.b2a_base64(encoded, newline=False).decode("ascii")
 
     def _build_vless(self, remark: str, address: str, inbound: SubscriptionInboundData, settings: dict) -> str:
         """Build VLESS link"""
@@ -243,12 +238,7 @@ class StandardLinks(BaseSubscription):
         if inbound.vless_route:
             id = self.vless_route(id, inbound.vless_route)
 
-        payload = {
-            "encryption": inbound.encryption,
-            "security": inbound.tls_config.tls,
-            "type": inbound.network,
-            "headerType": getattr(inbound.transport_config, "header_type", "none"),
-        }
+        payload = self._get_link_template("vless", inbound)
 
         # Only add flow if inbound supports it
         if inbound.flow_enabled and (flow := settings.get("flow", "")):
@@ -260,19 +250,15 @@ class StandardLinks(BaseSubscription):
             # Use stored TLS config instance
             self._apply_tls_settings(payload, inbound.tls_config, inbound.fragment_settings)
 
-        payload = self._normalize_and_remove_none_values(payload)
-        return f"vless://{id}@{address}:{inbound.port}?{urlparse.urlencode(payload)}#{urlparse.quote(remark)}"
+        payload = self._compact_payload(payload)
+        return f"vless://{id}@{address}:{inbound.port}?{self._build_query(payload)}#{_quote_remark(remark)}"
 
     def _build_trojan(self, remark: str, address: str, inbound: SubscriptionInboundData, settings: dict) -> str:
         """Build Trojan link"""
         # Process grpc path
         path = self._process_path(inbound)
 
-        payload = {
-            "security": inbound.tls_config.tls,
-            "type": inbound.network,
-            "headerType": getattr(inbound.transport_config, "header_type", "none"),
-        }
+        payload = self._get_link_template("trojan", inbound)
 
         self._apply_transport_settings(payload, "trojan", inbound, path)
 
@@ -280,9 +266,9 @@ class StandardLinks(BaseSubscription):
             # Use stored TLS config instance
             self._apply_tls_settings(payload, inbound.tls_config, inbound.fragment_settings)
 
-        payload = self._normalize_and_remove_none_values(payload)
+        payload = self._compact_payload(payload)
         password = urlparse.quote(settings["password"], safe=":")
-        return f"trojan://{password}@{address}:{inbound.port}?{urlparse.urlencode(payload)}#{urlparse.quote(remark)}"
+        return f"trojan://{password}@{address}:{inbound.port}?{self._build_query(payload)}#{_quote_remark(remark)}"
 
     def _build_shadowsocks(self, remark: str, address: str, inbound: SubscriptionInboundData, settings: dict) -> str:
         """Build Shadowsocks link"""
@@ -290,24 +276,33 @@ class StandardLinks(BaseSubscription):
             inbound.is_2022,
             inbound.method,
             settings["method"],
-            getattr(inbound, "password", None),
+            inbound.password,
             settings["password"],
         )
 
-        encoded = base64.b64encode(f"{method}:{password}".encode()).decode()
-        return f"ss://{encoded}@{address}:{inbound.port}#{urlparse.quote(remark)}"
+        encoded = binascii.b2a_base64(f"{method}:{password}".encode(), newline=False).decode("ascii")
+        return f"ss://{encoded}@{address}:{inbound.port}#{_quote_remark(remark)}"
 
     # ========== Helper Methods ==========
 
+    @staticmethod
+    def _compact_payload(payload: dict) -> dict:
+        """Drop empty values from a flat link payload in a single pass"""
+        return {k: v.value if isinstance(v, Enum) else v for k, v in payload.items() if v not in (None, "", 0)}
+
+    @staticmethod
+    def _build_query(payload: dict) -> str:
+        """Build the link query string; payload keys are plain ASCII so only values are encoded"""
+        return "&".join(f"{key}={_quote_query_value(str(value))}" for key, value in payload.items())
+
     def _process_path(self, inbound: SubscriptionInboundData) -> str:
         """Process path for grpc if needed"""
         path = inbound.transport_config.path
         if inbound.network in ("grpc", "gun"):
-            multi_mode = getattr(inbound.transport_config, "multi_mode", False)
-            if multi_mode:
+            if inbound.transport_config.multi_mode:
                 path = self.get_grpc_multi(path)
             else:
                 path = self.get_grpc_gun(path)
-            if inbound.transport_config.path.startswith("/"):
+            if inbound.transport_config.path.startswith("/") and _GRPC_PATH_UNSAFE.search(path):
                 path = quote(path, safe="-_.!~*'()")
         return path
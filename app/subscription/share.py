@@ -231,6 +231,7 @@ async def process_host(
     # Create a copy of the inbound data with selected random values
     inbound_copy = deepcopy(inbound)
 
+    # sni and host are resolved to plain strings once here; link builders read them as-is
     # Update TLS config with selected values
     inbound_copy.tls_config.sni = sni
     inbound_copy.tls_config.reality_short_id = reality_sid
@@ -66,7 +66,7 @@ class SingBoxConfiguration(BaseSubscription):
         # Not supported by sing-box
         if inbound.network in ("kcp", "splithttp", "xhttp"):
             return
-        if inbound.network == "quic" and getattr(inbound.transport_config, "header_type", "none") != "none":
+        if inbound.network == "quic" and inbound.transport_config.header_type != "none":
             return
 
         remark = self._remark_validation(remark)
@@ -167,11 +167,11 @@ class SingBoxConfiguration(BaseSubscription):
     def _apply_transport(self, network: str, inbound: SubscriptionInboundData, path: str) -> dict | None:
         """Apply transport settings using registry pattern"""
         # Map network types
-        if network in ("tcp", "raw") and getattr(inbound.transport_config, "header_type", "none") == "http":
+        if network in ("tcp", "raw") and inbound.transport_config.header_type == "http":
             network = "http"
 
         # For pure TCP connections without HTTP headers, don't add transport config
-        if network in ("tcp", "raw") and getattr(inbound.transport_config, "header_type", "none") != "http":
+        if network in ("tcp", "raw") and inbound.transport_config.header_type != "http":
             return None
 
         handler = self.transport_handlers.get(network)
@@ -316,9 +316,7 @@ class XrayConfiguration(BaseSubscription):
                 "fingerprint": tls_config.fingerprint,
                 "echConfigList": tls_config.ech_config_list,
                 "pinnedPeerCertSha256": tls_config.pinned_peer_cert_sha256,
-                "verifyPeerCertByName": ",".join(tls_config.verify_peer_cert_by_name)
-                if tls_config.verify_peer_cert_by_name
-                else "",
+                "verifyPeerCertByName": tls_config.vcn_str,
             }
             if tls_config.alpn_list:
                 config["alpn"] = tls_config.alpn_list  # Use list for xray
@@ -2,12 +2,32 @@ import html
 import json
 import re
 from datetime import datetime as dt, timezone as tz
+from enum import Enum
 from typing import Union
 from uuid import UUID
 
 from pydantic import ValidationError
 
 
+def remove_empty_values(data: dict) -> dict:
+    """
+    Recursively drop None, empty string and 0 values, and nested dicts left empty.
+    Enum values are replaced by their value.
+    """
+    cleaned = {}
+    for key, value in data.items():
+        if value in (None, "", 0):
+            continue
+        if isinstance(value, dict):
+            if value := remove_empty_values(value):
+                cleaned[key] = value
+        elif isinstance(value, Enum):
+            cleaned[key] = value.value
+        else:
+            cleaned[key] = value
+    return cleaned
+
+
 def yml_uuid_representer(dumper, data):
     return dumper.represent_scalar("tag:yaml.org,2002:str", str(data))
 
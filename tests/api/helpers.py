@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Iterable
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterable, Iterator
 from uuid import uuid4
 
 from fastapi import status
+from sqlalchemy import event
 
-from tests.api import client
+from app.db.crud.node import create_node as db_create_node, remove_node as db_remove_node
+from app.db.models import Node
+from app.models.node import NodeCreate
+from tests.api import TestSession, client, engine
 from tests.api.sample_data import XRAY_CONFIG
 from config import ROLE, NATS_ENABLED
 
@@ -208,3 +213,30 @@ def create_user_template(
 def delete_user_template(access_token: str, template_id: int) -> None:
     response = client.delete(f"/api/user_template/{template_id}", headers=auth_headers(access_token))
     assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+@contextmanager
+def record_statements() -> Iterator[list[str]]:
+    """Collect the SQL statements the test engine executes inside the block."""
+    statements: list[str] = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record_statement)
+
+
+@asynccontextmanager
+async def temp_db_node(node: NodeCreate) -> AsyncIterator[int]:
+    """Create a node through the crud layer, yield its id and remove it afterwards."""
+    async with TestSession() as session:
+        node_id = (await db_create_node(session, node)).id
+    try:
+        yield node_id
+    finally:
+        async with TestSession() as session:
+            await db_remove_node(session, await session.get(Node, node_id))
@@ -7,9 +7,24 @@ from uuid import UUID, uuid4
 import pytest
 from fastapi import status
 from sqlalchemy import func, inspect, select
+from sqlalchemy.exc import InvalidRequestError
 
+from app.db import base
+from app.db.base import REQUEST_NODE_CACHE_KEY
 from app.db.crud.core import create_core_config, remove_core_config
-from app.db.crud.node import create_node as db_create_node, remove_node as db_remove_node
+from app.db.crud.node import (
+    _build_node_select_stmt,
+    _get_cached_node,
+    bulk_reset_node_usage as db_bulk_reset_node_usage,
+    create_node as db_create_node,
+    get_node as db_get_node,
+    get_node_by_id as db_get_node_by_id,
+    get_nodes as db_get_nodes,
+    get_nodes_to_reset_usage as db_get_nodes_to_reset_usage,
+    modify_node as db_modify_node,
+    remove_node as db_remove_node,
+    update_node_status as db_update_node_status,
+)
 from app.db.models import (
     CoreConfig,
     DataLimitResetStrategy,
@@ -23,7 +38,7 @@ from app.db.models import (
     User,
 )
 from app.models.core import CoreCreate
-from app.models.node import NodeCreate, NodeResponse, NodeSettings, NodesResponse
+from app.models.node import NodeCreate, NodeModify, NodeResponse, NodeSettings, NodesResponse
 from app.models.stats import (
     NodeRealtimeStats,
     NodeStats,
@@ -32,8 +47,9 @@ from app.models.stats import (
     NodeUsageStatsList,
     Period,
 )
+import config
 from tests.api import TestSession, client
-from tests.api.helpers import auth_headers, unique_name
+from tests.api.helpers import auth_headers, record_statements, temp_db_node, unique_name
 from tests.api.sample_data import XRAY_CONFIG
 
 VALID_CERTIFICATE = """-----BEGIN CERTIFICATE-----
@@ -689,3 +705,196 @@ async def test_remove_node_deletes_associated_usage_tables():
         assert await count_rows(NodeStat) == 0
         remaining_nodes = await session.scalar(select(func.count()).select_from(Node).where(Node.id == node_id))
         assert remaining_nodes == 0
+
+
+@pytest.mark.asyncio
+async def test_get_nodes_does_not_lazy_load_relationships(monkeypatch: pytest.MonkeyPatch):
+    # get_nodes only raises on lazy loads in debug mode
+    monkeypatch.setattr(config, "DEBUG", True)
+    async with temp_db_node(NodeCreate(**node_create_payload(name=unique_name("eager_node")))) as node_id:
+        async with TestSession() as session:
+            session.add_all([NodeUsageResetLogs(node_id=node_id, uplink=10, downlink=20) for _ in range(3)])
+            await session.commit()
+
+        async with TestSession() as session:
+            nodes, _ = await db_get_nodes(session, ids=[node_id])
+            assert len(nodes) == 1
+
+            with record_statements() as statements:
+                node = nodes[0]
+                assert len(node.usage_logs) == 3
+                assert node.lifetime_uplink == 30
+                assert node.lifetime_downlink == 60
+                with pytest.raises(InvalidRequestError):
+                    _ = node.core_config
+
+            assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_get_nodes_to_reset_usage_filters_time_based_schedules():
+    now = datetime.now(timezone.utc)
+    async with TestSession() as session:
+        due_node = await db_create_node(
+            session,
+            NodeCreate(
+                **node_create_payload(
+                    name=unique_name("reset_due"), data_limit_reset_strategy=DataLimitResetStrategy.day, reset_time=0
+                )
+            ),
+        )
+        recent_node = await db_create_node(
+            session,
+            NodeCreate(
+                **node_create_payload(
+                    name=unique_name("reset_recent"), data_limit_reset_strategy=DataLimitResetStrategy.day, reset_time=0
+                )
+            ),
+        )
+        due_node.created_at = now - timedelta(days=2)
+        recent_node.created_at = now - timedelta(days=2)
+        due_node.status = recent_node.status = NodeStatus.connected
+        session.add(NodeUsageResetLogs(node_id=recent_node.id, uplink=0, downlink=0))
+        await session.commit()
+        node_ids = {due_node.id, recent_node.id}
+
+    try:
+        async with TestSession() as session:
+            nodes = await db_get_nodes_to_reset_usage(session)
+            assert {node.id for node in nodes} & node_ids == {due_node.id}
+    finally:
+        async with TestSession() as session:
+            for node_id in node_ids:
+                await db_remove_node(session, await session.get(Node, node_id))
+
+
+@pytest.mark.asyncio
+async def test_bulk_reset_node_usage_logs_and_resets_nodes():
+    async with TestSession() as session:
+        limited_node = await db_create_node(
+            session, NodeCreate(**node_create_payload(name=unique_name("bulk_limited")))
+        )
+        active_node = await db_create_node(session, NodeCreate(**node_create_payload(name=unique_name("bulk_active"))))
+        limited_node.status = NodeStatus.limited
+        active_node.status = NodeStatus.connected
+        limited_node.uplink, limited_node.downlink = 10, 20
+        active_node.uplink, active_node.downlink = 30, 40
+        await session.commit()
+        node_ids = [limited_node.id, active_node.id]
+
+    try:
+        async with TestSession() as session:
+            nodes = (await session.execute(select(Node).where(Node.id.in_(node_ids)))).scalars().all()
+            reset_nodes = {node.id: node for node in await db_bulk_reset_node_usage(session, list(nodes))}
+
+            assert set(reset_nodes) == set(node_ids)
+            assert reset_nodes[limited_node.id].status == NodeStatus.connecting
+            assert reset_nodes[active_node.id].status == NodeStatus.connected
+            for node in reset_nodes.values():
+                assert (node.uplink, node.downlink) == (0, 0)
+
+            assert [(log.uplink, log.downlink) for log in reset_nodes[limited_node.id].usage_logs] == [(10, 20)]
+            assert [(log.uplink, log.downlink) for log in reset_nodes[active_node.id].usage_logs] == [(30, 40)]
+    finally:
+        async with TestSession() as session:
+            for node_id in node_ids:
+                await db_remove_node(session, await session.get(Node, node_id))
+
+
+@pytest.mark.asyncio
+async def test_update_node_status_does_not_reselect_node():
+    async with temp_db_node(NodeCreate(**node_create_payload(name=unique_name("status_node")))) as node_id:
+        async with TestSession() as session:
+            db_node = await session.get(Node, node_id)
+            await db_node.awaitable_attrs.usage_logs
+
+            with record_statements() as statements:
+                updated = await db_update_node_status(
+                    session, db_node, NodeStatus.error, message="boom", xray_version="1.8.0", node_version="0.1.0"
+                )
+
+            assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+            assert updated is db_node
+            assert (updated.status, updated.message, updated.xray_version, updated.node_version) == (
+                NodeStatus.error,
+                "boom",
+                "1.8.0",
+                "0.1.0",
+            )
+            assert updated.last_status_change is not None
+            assert not session.dirty
+
+        async with TestSession() as session:
+            stored = await session.get(Node, node_id)
+            assert (stored.status, stored.message) == (NodeStatus.error, "boom")
+
+
+@pytest.mark.asyncio
+async def test_modify_node_only_applies_fields_set():
+    async with temp_db_node(
+        NodeCreate(**node_create_payload(name=unique_name("modify_node"), api_port=45000))
+    ) as node_id:
+        async with TestSession() as session:
+            db_node = await session.get(Node, node_id)
+            db_node = await db_modify_node(session, db_node, NodeModify(port=43000, keep_alive=None))
+
+            assert db_node.port == 43000
+            assert db_node.api_port == 45000
+            assert db_node.keep_alive == 60
+
+
+@pytest.mark.asyncio
+async def test_create_node_uses_single_insert_returning():
+    async with TestSession() as session:
+        if not session.bind.dialect.insert_returning:
+            pytest.skip("dialect has no INSERT ... RETURNING")
+
+        with record_statements() as statements:
+            db_node = await db_create_node(session, NodeCreate(**node_create_payload(name=unique_name("returning"))))
+
+        try:
+            assert len(statements) == 1
+            assert statements[0].startswith("INSERT INTO nodes")
+            assert db_node.id is not None
+            assert db_node.created_at is not None
+            assert db_node.status == NodeStatus.connecting
+            assert (db_node.uplink, db_node.downlink) == (0, 0)
+            assert db_node.usage_logs == []
+            assert db_node.lifetime_uplink == 0
+        finally:
+            await db_remove_node(session, db_node)
+
+
+@pytest.mark.asyncio
+async def test_node_lookups_are_cached_per_request_session(monkeypatch: pytest.MonkeyPatch):
+    # Go through the real get_db dependency (the API tests override it) on the test engine
+    monkeypatch.setattr(base, "SessionLocal", TestSession)
+    node_name = unique_name("cached_node")
+    async with temp_db_node(NodeCreate(**node_create_payload(name=node_name))) as node_id:
+        request_db = base.get_db()
+        session = await anext(request_db)
+        try:
+            with record_statements() as statements:
+                first = await db_get_node_by_id(session, node_id)
+                selects_after_first_lookup = len(statements)
+                assert await db_get_node_by_id(session, node_id) is first
+                assert await db_get_node(session, node_name) is first
+                assert len(statements) == selects_after_first_lookup
+
+                await db_update_node_status(session, first, NodeStatus.error, message="boom")
+                statements.clear()
+                assert (await db_get_node_by_id(session, node_id)).message == "boom"
+                assert statements
+
+                # A lookup key that differs from the stored name is cached as an alias too
+                lookup_key = ("name", node_name.upper())
+                stmt = _build_node_select_stmt().where(func.lower(Node.name) == node_name.lower())
+                aliased = await _get_cached_node(session, lookup_key, stmt)
+                statements.clear()
+                assert await _get_cached_node(session, lookup_key, stmt) is aliased
+                assert not statements
+
+                await db_update_node_status(session, aliased, NodeStatus.connected)
+                assert lookup_key not in session.info[REQUEST_NODE_CACHE_KEY]
+        finally:
+            await request_db.aclose()
@@ -19,7 +19,7 @@ from app.db.models import (
 )
 from app.models.stats import Period, NodeUsageStatsList, UserUsageStatsList
 from app.models.proxy import ProxyTable
-from app.db.crud.node import get_nodes_usage
+from app.db.crud.node import get_nodes_usage, rebuild_node_usage_daily
 from app.db.crud.user import get_user_usages, get_all_users_usages
 from app.db.crud.admin import get_admin_usages
 from tests.api import TestSession
@@ -369,6 +369,9 @@ class TestGetNodesUsageTimezone:
             for idx, ts in enumerate(all_timestamps):
                 record = NodeUsage(created_at=ts, node_id=node_id, uplink=1000000 + idx, downlink=10000000 + idx)
                 session.add(record)
+            await session.flush()
+            # Day buckets are served from the daily rollup the usage recorder keeps in sync
+            await rebuild_node_usage_daily(session)
             await session.commit()
 
             result = await get_nodes_usage(
@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool, StaticPool
 
 from app.db import base
-from app.db.models import Admin, Node, NodeUsage, NodeUserUsage, System, User
+from app.db.models import Admin, Node, NodeUsage, NodeUsageDaily, NodeUserUsage, System, User
 from app.jobs import record_usages
 from app.models.proxy import ProxyTable
 from config import SQLALCHEMY_DATABASE_URL
@@ -282,6 +282,11 @@ async def test_record_node_usages_updates_totals(monkeypatch: pytest.MonkeyPatch
         assert node_usage_totals[node_one_id][1] > 0
         assert node_usage_totals[node_two_id][1] > 0
 
+        daily_rows = await session.execute(
+            select(NodeUsageDaily.node_id, NodeUsageDaily.uplink, NodeUsageDaily.downlink)
+        )
+        assert {row.node_id: (row.uplink, row.downlink) for row in daily_rows.all()} == node_usage_totals
+
         system_totals = await session.execute(select(System.uplink, System.downlink).where(System.id == system_id))
         system_row = system_totals.one()
         assert system_row.uplink == sum(values[0] for values in node_totals.values())